@@ -1 +1 @@
-from .throttle import Throttle, throttle_decorator
+from .throttle import AsyncThrottle, Throttle, throttle_decorator
@@ -1,9 +1,13 @@
+import asyncio
+import heapq
+import itertools
 import logging
+import os
 import sys
 import time
 from enum import Enum, auto
-from threading import Thread, Lock
-from typing import Callable, List, Optional, Any
+from threading import Condition, Event, Thread, Lock, current_thread
+from typing import Callable, Iterable, Optional, Any
 
 
 class ProgressState(Enum):
@@ -12,6 +16,105 @@ class ProgressState(Enum):
     STOPPED = auto()
 
 
+class _RenderPump:
+    """Renders every started Throttle from a single shared daemon thread.
+
+    Loaders sit in a heap ordered by when their next frame is due. A loader
+    with no new progress and no spinner to animate is parked instead, and
+    update() wakes it, so idle loaders cost nothing.
+    """
+
+    def __init__(self):
+        self._cond = Condition()
+        self._heap = []  # (due time, sequence number, loader)
+        self._parked = set()
+        self._sequence = itertools.count()
+        self._current = None
+        self._thread = None
+
+    def register(self, loader):
+        """Schedules a loader's first frame and starts the pump thread if needed."""
+        with self._cond:
+            self._schedule(loader, time.monotonic())
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name="throttle-render", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def unregister(self, loader):
+        """Removes a loader, waiting for any frame of it that is being written."""
+        with self._cond:
+            self._parked.discard(loader)
+            self._heap = [entry for entry in self._heap if entry[2] is not loader]
+            heapq.heapify(self._heap)
+            # A render callback closing its own loader runs on the pump thread
+            while self._current is loader and current_thread() is not self._thread:
+                self._cond.wait()
+
+    def wake(self, loader):
+        """Reschedules a parked loader after update() reported new progress."""
+        with self._cond:
+            if loader in self._parked:
+                self._unpark(loader)
+                self._cond.notify()
+
+    def _schedule(self, loader, due):
+        heapq.heappush(self._heap, (due, next(self._sequence), loader))
+
+    def _park(self, loader):
+        loader._parked = True
+        self._parked.add(loader)
+        # update() sets the tick before checking `_parked`, so re-checking the
+        # tick here means a concurrent update is never missed.
+        if loader._tick.is_set():
+            self._unpark(loader)
+
+    def _unpark(self, loader):
+        loader._parked = False
+        self._parked.discard(loader)
+        self._schedule(loader, loader._next_frame)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    delay = self._heap[0][0] - time.monotonic()
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+                loader = heapq.heappop(self._heap)[2]
+                if not (loader.spinner or loader._tick.is_set()):
+                    self._park(loader)
+                    continue
+                self._current = loader
+
+            # Write outside the condition so update() and other loaders never
+            # wait on console I/O.
+            failed = False
+            try:
+                loader._tick.clear()
+                loader._write_frame()
+            except Exception:
+                logging.exception(f"Error while rendering progress for '{loader.desc}'.")
+                failed = True
+            # Callback errors are handed back to the caller, so the loader keeps rendering
+            loader._fire_update_callback_on_tick()
+
+            with self._cond:
+                self._current = None
+                self._cond.notify_all()
+                if loader.running and not failed:
+                    # Cap the redraw rate; updates arriving meanwhile are coalesced.
+                    loader._next_frame = time.monotonic() + loader.refresh_rate
+                    self._schedule(loader, loader._next_frame)
+
+
+_PUMP = _RenderPump()
+
+
 class Throttle:
     """
     A versatile progress indicator library for Python, providing multiple styles
@@ -25,8 +128,9 @@ class Throttle:
                                 Defaults to "Progress".
         bar_length (int, optional): The length of the progress bar in characters.
                                     Defaults to 20.
-        refresh_rate (float, optional): How often the progress indicator is updated
-                                        (in seconds).
+        refresh_rate (float, optional): The minimum interval between redraws
+                                        (in seconds). Only the spinner redraws
+                                        without new progress.
                                         Default to 0.1.
         spinner (bool, optional): If True, uses a spinning animation instead of a bar.
                                     Defaults to False.
@@ -55,8 +159,9 @@ class Throttle:
                                                 - empty_char: The empty character.
                                             Defaults to None.
         update_callback (Optional[Callable[[int], None]], optional):
-                                            A custom function to be called whenever
-                                            the progress is updated.
+                                            A custom function to be called with the
+                                            latest progress at most once per redraw,
+                                            and once more on close().
                                             The callback
                                             function should take one argument:
                                                 - completed: The current progress count.
@@ -89,8 +194,11 @@ class Throttle:
                 t.update()
         ```
     """
-    VALID_STYLES = ["bar", "dots", "time_clock"]
-    VALID_COLORS = ["blue", "green", "red"]
+    VALID_STYLES = frozenset(("bar", "dots", "time_clock"))
+    VALID_COLORS = frozenset(("blue", "green", "red"))
+    COLOR_CODES = {"blue": "\033[94m", "green": "\033[92m", "red": "\033[91m"}
+    RESET_CODE = "\033[0m"
+    UPDATE_BATCH_SIZE = 16
 
     def __init__(
             self,
@@ -120,8 +228,13 @@ class Throttle:
         self.completed = 0
         self.refresh_rate = refresh_rate
         self.lock = Lock()
+        self._tick = Event()
         self.running = True
+        # Kept for compatibility; rendering now runs on the shared render pump thread
         self.render_thread = None
+        self._started = False
+        self._parked = False
+        self._next_frame = 0.0
         self.spinner = spinner
         self.spinner_chars = ["-", "\\", "|", "/"]
         self.spinner_index = 0
@@ -131,6 +244,36 @@ class Throttle:
         self.empty_char = empty_char
         self.render_callback = render_callback
         self.update_callback = update_callback
+        self._callback_pending = False
+        self._callback_error = None
+        self._last_output = None
+        self._is_tty = False
+        self._stdout_fd = None
+        self._stdout_encoding = None
+        self._stdout_errors = None
+
+        # Precomputed pieces for the bar renderer, so each frame is a single
+        # lookup plus one f-string instead of branching and string building.
+        color_prefix = self.COLOR_CODES[color]
+        self._bars = tuple(
+            f"{color_prefix}[{fill_char * i}{empty_char * (bar_length - i)}]{self.RESET_CODE}"
+            for i in range(bar_length + 1)
+        )
+        self._bar_head = f"{desc}: "
+        self._bar_tail = f"/{total} {unit})"
+        self._render_bar = self._compile_bar_renderer()
+
+        # Resolve the renderer once so each frame is a single call
+        if render_callback:
+            self._render = self._render_custom
+        elif spinner:
+            self._render = self._default_render_spinner
+        elif style == "dots":
+            self._render = self._default_render_dots
+        elif style == "time_clock":
+            self._render = self._default_render_time_clock
+        else:
+            self._render = self._render_bar
 
         # Clock Emojis for Progress Indicator
         self.clock_emojis = [
@@ -139,35 +282,30 @@ class Throttle:
             "🕚", "🕦"
         ]
 
+        # One ready-made frame per clock emoji
+        self._clock_frames = [f"{desc}: {emoji}" for emoji in self.clock_emojis]
+
     def render(self) -> str:
-        """Renders the progress indicator based on the chosen style.
+        """Renders the progress indicator exactly as the loader draws it.
 
-        This method determines the appropriate rendering function based on
-        the current style and calls it to get the formatted progress string.
+        Uses the renderer resolved at construction, so render_callback is
+        honoured. For the spinner each call advances the animation by one step.
 
         Returns:
             str: The formatted progress indicator string.
         """
-        if self.spinner:
-            return self._default_render_spinner()
-        elif self.style == "bar":
-            return self._default_render_bar()
-        elif self.style == "dots":
-            return self._default_render_dots()
-        elif self.style == "time_clock":
-            return self._default_render_time_clock()
-        else:
-            return self._default_render_bar()  # Default to bar
+        return self._render()
 
-    def _validate_input(self, style, color, fill_char, empty_char):
+    @staticmethod
+    def _validate_input(style, color, fill_char, empty_char):
         """Validates the input parameters for the Throttle instance."""
-        if style not in self.VALID_STYLES:
-            raise ValueError(f"Invalid style: {style}. 🤔 Valid styles are: {self.VALID_STYLES}")
-        if color not in self.VALID_COLORS:
-            raise ValueError(f"Invalid color: {color}. 🎨 Valid colors are: {self.VALID_COLORS}")
-        if not fill_char or len(fill_char) != 1:
+        if style not in Throttle.VALID_STYLES:
+            raise ValueError(f"Invalid style: {style}. 🤔 Valid styles are: {sorted(Throttle.VALID_STYLES)}")
+        if color not in Throttle.VALID_COLORS:
+            raise ValueError(f"Invalid color: {color}. 🎨 Valid colors are: {sorted(Throttle.VALID_COLORS)}")
+        if fill_char.__class__ is not str or len(fill_char) != 1:
             raise ValueError(f"Invalid fill_char: {fill_char}. 🚧 Fill character must be a single character.")
-        if not empty_char or len(empty_char) != 1:
+        if empty_char.__class__ is not str or len(empty_char) != 1:
             raise ValueError(f"Invalid empty_char: {empty_char}. 🚧 Empty character must be a single character.")
 
     def update(self, amount: int = 1):
@@ -180,28 +318,73 @@ class Throttle:
         """
         with self.lock:
             self.completed += amount
-            if self.update_callback:
-                self.update_callback(self.completed)
+        self._signal_update()
+
+    def _signal_update(self):
+        """Tells the renderer that `completed` changed and surfaces a pending callback error."""
+        # update_callback is debounced to the render tick, see _fire_update_callback
+        self._callback_pending = True
+        # Event.set() takes a lock even when already set; the pump clears the
+        # tick before it reads `completed`, so skipping a set tick loses nothing.
+        if not self._tick.is_set():
+            self._tick.set()
+        if self._parked:
+            _PUMP.wake(self)
+        if self._callback_error is not None:
+            self._raise_callback_error()
+
+    def _fire_update_callback(self):
+        """Reports the latest progress to update_callback if it changed since the last call."""
+        if self._callback_pending and self.update_callback:
+            # Clear before reading so an update racing with us is reported next time
+            self._callback_pending = False
+            self.update_callback(self.completed)
+
+    def _fire_update_callback_on_tick(self):
+        """Fires update_callback from a render tick, keeping any error for the caller."""
+        try:
+            self._fire_update_callback()
+        except Exception as error:
+            self._callback_error = error
 
-    def _default_render_bar(self) -> str:
-        """Default rendering for the bar style progress indicator."""
-        progress = int((self.completed / self.total) * self.bar_length)
-        filled_bar = "[" + self.fill_char * progress + self.empty_char * (
-                self.bar_length - progress) + "]"
-        percentage = int((self.completed / self.total) * 100)
+    def _raise_callback_error(self):
+        """Re-raises an update_callback error caught on a render tick."""
+        error, self._callback_error = self._callback_error, None
+        raise error
 
-        # Add color support (if available)
-        if self.color == "blue":
-            filled_bar = f"\033[94m{filled_bar}\033[0m"  # Blue
-        elif self.color == "green":
-            filled_bar = f"\033[92m{filled_bar}\033[0m"  # Green
-        elif self.color == "red":
-            filled_bar = f"\033[91m{filled_bar}\033[0m"  # Red
+    def _render_custom(self) -> str:
+        """Rendering through the user supplied render_callback."""
+        return self.render_callback(self.completed, self.total, self.desc,
+                                    self.fill_char,
+                                    self.empty_char)
 
-        return f"{self.desc}: {filled_bar} {percentage}% ({self.completed}/{self.total} {self.unit})"
+    def _default_render_bar(self) -> str:
+        """Default rendering for the bar style progress indicator."""
+        return self._render_bar()
+
+    def _compile_bar_renderer(self) -> Callable[[], str]:
+        """Builds a bar renderer with everything except `completed` bound into the closure."""
+        bars = self._bars
+        head = self._bar_head
+        tail = self._bar_tail
+        total = self.total
+        bar_length = self.bar_length
+
+        def render_bar() -> str:
+            completed = self.completed
+            progress = completed * bar_length // total
+            if progress > bar_length:
+                progress = bar_length
+            elif progress < 0:
+                progress = 0
+            return f"{head}{bars[progress]} {completed * 100 // total}% ({completed}{tail}"
+
+        return render_bar
 
     def _default_render_spinner(self) -> str:
         """Default rendering for the spinner style progress indicator."""
+        # Advance the animation here so other styles never pay for it
+        self.spinner_index = (self.spinner_index + 1) % len(self.spinner_chars)
         return f"{self.desc}: {self.spinner_chars[self.spinner_index]}"
 
     def _default_render_dots(self) -> str:
@@ -212,48 +395,86 @@ class Throttle:
     def _default_render_time_clock(self) -> str:
         """Default rendering for the time clock style progress indicator."""
         # Calculate the clock emoji index based on progress
-        clock_index = int((self.completed / self.total) * len(self.clock_emojis)) % len(
-            self.clock_emojis)
-        return f"{self.desc}: {self.clock_emojis[clock_index]}"
+        n = len(self._clock_frames)
+        return self._clock_frames[self.completed * n // self.total % n]
+
+    def _write_frame(self):
+        """Renders the current frame and writes it to the console if it changed."""
+        if not self._is_tty:
+            return
+        # Rendering only reads `completed`, so it does not need the lock;
+        # holding it here would stall update() for the whole console write.
+        output = self._render()
+
+        # Only touch the console when the frame actually changed
+        if output != self._last_output:
+            self._write_console(f"\r{output}")
+            self._last_output = output
+
+    def _bind_console(self):
+        """Looks up whether stdout is a terminal and its file descriptor."""
+        try:
+            self._is_tty = sys.stdout.isatty()
+        except (AttributeError, ValueError):
+            self._is_tty = False
+        try:
+            fd = sys.stdout.fileno()
+            self._stdout_fd = fd if os.isatty(fd) else None
+        except (AttributeError, OSError, ValueError):
+            self._stdout_fd = None
+        if self._stdout_fd is not None:
+            self._stdout_encoding = sys.stdout.encoding or "utf-8"
+            self._stdout_errors = sys.stdout.errors or "strict"
+            # Anything already queued in the text layer must land before our frames
+            sys.stdout.flush()
+
+    def _write_console(self, text: str):
+        """Writes text straight to the terminal fd if there is one, else through sys.stdout."""
+        if self._stdout_fd is not None:
+            self._write_fd(memoryview(text.encode(self._stdout_encoding, self._stdout_errors)))
+        else:
+            sys.stdout.write(text)
+            sys.stdout.flush()
 
-    def _render_progress(self):
-        """Handles rendering the progress indicator in a separate thread."""
-        while self.running:
-            with self.lock:
-                if self.render_callback:
-                    output = self.render_callback(self.completed, self.total, self.desc,
-                                                  self.fill_char,
-                                                  self.empty_char)
-                elif self.spinner:
-                    output = self._default_render_spinner()
-                elif self.style == "bar":
-                    output = self._default_render_bar()
-                elif self.style == "dots":
-                    output = self._default_render_dots()
-                elif self.style == "time_clock":
-                    output = self._default_render_time_clock()
-                else:
-                    output = self._default_render_bar()  # Default to bar
-
-                sys.stdout.write(f"\r{output}")
-                sys.stdout.flush()
-                self.spinner_index = (self.spinner_index + 1) % len(
-                    self.spinner_chars)
-            time.sleep(self.refresh_rate)
+    def _write_fd(self, data: memoryview):
+        """Writes all of `data` to the terminal file descriptor."""
+        while data:
+            data = data[os.write(self._stdout_fd, data):]
 
     def close(self):
         """Stops the progress indicator and cleans up the console output."""
+        was_running = self.running
         self.running = False
-        if self.render_thread:
-            self.render_thread.join()
-        sys.stdout.write("\n")
-        sys.stdout.flush()
+        _PUMP.unregister(self)
+        self._write_final_output(was_running)
+
+    def _write_final_output(self, was_running: bool):
+        """Writes the closing frame and newline, then reports the final progress."""
+        if was_running and self._started:
+            if self._is_tty:
+                # Show progress reported since the last scheduled frame
+                self._write_frame()
+            else:
+                # Redirected output gets no live frames, only the final state
+                self._write_console(self._render())
+        self._write_console("\n")
+        self._fire_update_callback()
+        if self._callback_error is not None:
+            self._raise_callback_error()
 
     def start(self):
-        """Starts the progress indicator rendering in a separate thread."""
-        self.render_thread = Thread(target=self._render_progress)
-        self.render_thread.daemon = True
-        self.render_thread.start()
+        """Starts rendering the progress indicator on the shared render thread.
+
+        When stdout is not a terminal, carriage-return redraws are useless, so
+        nothing is rendered until close() writes the final state. The loader
+        is still scheduled if it has an update_callback to drive.
+        """
+        self._bind_console()
+        self._started = True
+        if not (self._is_tty or self.update_callback):
+            return
+        self._tick.set()  # Draw the first frame straight away
+        _PUMP.register(self)
 
     def __enter__(self):
         """Starts the progress indicator when used in a `with` statement."""
@@ -264,7 +485,7 @@ class Throttle:
         """Closes the progress indicator when exiting a `with` block."""
         self.close()
 
-    def with_function(self, func: Callable[[Any, 'Throttle'], None], data: List[Any], *args, **kwargs):
+    def with_function(self, func: Callable[[Any, 'Throttle'], None], data: Iterable[Any], *args, **kwargs):
         """
         Executes a function with integrated progress tracking.
 
@@ -276,34 +497,133 @@ class Throttle:
                                                         It should accept a data item
                                                         and a Throttle instance as
                                                         arguments.
-            data (List[Any]): The list of data items to process.
+            data (Iterable[Any]): The data items to process. Any iterable works,
+                                    including generators, which are consumed
+                                    lazily one item at a time.
             *args: Additional positional arguments to pass to `func`.
             **kwargs: Additional keyword arguments to pass to `func`.
 
         Raises:
-            ValueError: If the provided data list is empty.
+            ValueError: If the provided data yields no items.
         """
-        if not data:
-            raise ValueError("Data list is empty. 😕 Please provide some data to process.")
-
+        # Emptiness is only known after iterating, so generators are never materialized
+        i = -1
+        pending = 0
         try:
             for i, item in enumerate(data):
                 func(item, self)
-                self.update()
+                pending += 1
+                # Report completions in batches, or straight away once the
+                # renderer has picked up the previous update and is idle.
+                if pending >= self.UPDATE_BATCH_SIZE or not self._tick.is_set():
+                    # Reset first: update() may raise a callback error after counting
+                    amount, pending = pending, 0
+                    self.update(amount)
 
                 # Optional: Log progress at regular intervals
                 if i % 10 == 0:  # Log every 10 items (adjust as needed)
                     logging.info(f"Processed {i + 1}/{self.total} items.")
-
-                time.sleep(0.1)  # Consider making this delay configurable
         except Exception as e:
+            if pending:
+                amount, pending = pending, 0
+                self.update(amount)
             self.close()  # Ensure the progress indicator is closed on error
             print(f"ERROR:root:An error occurred during processing: {e}")
             raise
 
+        if i < 0:
+            raise ValueError("Data list is empty. 😕 Please provide some data to process.")
+        if pending:
+            self.update(pending)
         self.close()
 
 
+class AsyncThrottle(Throttle):
+    """
+    A Throttle for asyncio code that renders from a task on the running event
+    loop instead of a dedicated thread.
+
+    Accepts the same arguments as Throttle. `start()` must be called from
+    within a running event loop; prefer `async with`, which also waits for the
+    render task to finish on exit.
+
+    Example Usage:
+        ```python
+        from throttle import AsyncThrottle
+        import asyncio
+
+        async def main():
+            async with AsyncThrottle(total=10, desc="Fetching") as throttle:
+                for i in range(10):
+                    await asyncio.sleep(0.2)
+                    throttle.update()
+
+        asyncio.run(main())
+        ```
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.render_task = None
+
+    def update(self, amount: int = 1):
+        """
+        Updates the progress counter.
+
+        Everything runs on the event loop thread, so no lock is taken.
+
+        Args:
+            amount (int, optional): The amount by which to increment the progress.
+                                    Default to 1.
+        """
+        self.completed += amount
+        self._signal_update()
+
+    async def _render_loop(self):
+        """Handles rendering the progress indicator as an event loop task."""
+        while self.running:
+            self._write_frame()
+            self._fire_update_callback_on_tick()
+            # Cap the redraw rate; updates arriving meanwhile are coalesced.
+            await asyncio.sleep(self.refresh_rate)
+            if not self.spinner:
+                await self._tick.wait()
+            self._tick.clear()
+
+    def start(self):
+        """Starts the progress indicator rendering as a task on the running event loop."""
+        self._bind_console()
+        self._started = True
+        self._tick = asyncio.Event()
+        if not (self._is_tty or self.update_callback):
+            return
+        self.render_task = asyncio.ensure_future(self._render_loop())
+
+    def close(self):
+        """Stops the progress indicator and cleans up the console output."""
+        was_running = self.running
+        self.running = False
+        if self.render_task:
+            self.render_task.cancel()
+        self._write_final_output(was_running)
+
+    async def __aenter__(self):
+        """Starts the progress indicator when used in an `async with` statement."""
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Closes the progress indicator when exiting an `async with` block."""
+        try:
+            self.close()
+        finally:
+            if self.render_task:
+                try:
+                    await self.render_task
+                except asyncio.CancelledError:
+                    pass
+
+
 def throttle_decorator(total: int, **kwargs):
     """
     Decorator to easily add a progress indicator to a function.
@@ -1,5 +1,8 @@
+import os
+import select
 import sys
 import time
+from io import StringIO
 from typing import Any
 
 from src.throttle import throttle_decorator, Throttle
@@ -21,3 +24,24 @@ def process_data(data, throttle_loader=None):
         if throttle_loader:
             throttle_loader.update()
         print(f"Processed {item}")
+
+
+class TTYStringIO(StringIO):
+    """A StringIO that reports itself as a terminal, so loaders render live frames into it."""
+
+    def isatty(self) -> bool:
+        return True
+
+
+def read_pty(master: int) -> bytes:
+    """Reads everything currently buffered on a pty master without blocking."""
+    output = b""
+    while select.select([master], [], [], 0.1)[0]:
+        try:
+            chunk = os.read(master, 4096)
+        except OSError:  # EIO once the slave side is closed and drained
+            break
+        if not chunk:
+            break
+        output += chunk
+    return output
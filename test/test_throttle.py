@@ -1,10 +1,13 @@
+import asyncio
+import os
+import threading
 import time
 import unittest
-from io import StringIO
+from io import BytesIO, StringIO, TextIOWrapper
 from unittest.mock import patch, Mock
 
-from src.throttle import Throttle
-from test.test_helper import process_data, my_example_function
+from src.throttle import AsyncThrottle, Throttle
+from test.test_helper import TTYStringIO, process_data, my_example_function, read_pty
 
 
 class TestProgressLoader(unittest.TestCase):
@@ -37,11 +40,25 @@ class TestProgressLoader(unittest.TestCase):
         expected_output = "\033[91m[===       ]\033[0m"  # Red bar for 3/10 progress
         self.assertIn(expected_output, loader._default_render_bar())
 
+    def test_default_render_bar_exact_percentage(self):
+        loader = Throttle(total=100, desc="Test", bar_length=10)
+        loader.update(29)
+        self.assertIn("29% (29/100 items)", loader._default_render_bar())
+
+    def test_default_render_bar_overflow(self):
+        loader = Throttle(total=10, desc="Test", bar_length=10, fill_char="=", empty_char=" ")
+        loader.update(15)
+        self.assertIn("[==========]", loader._default_render_bar())
+
     def test_default_render_spinner(self):
         loader = Throttle(total=10, desc="Test", spinner=True)
         output = loader._default_render_spinner()
         self.assertIn(loader.spinner_chars[loader.spinner_index], output)
 
+    def test_render_uses_render_callback(self):
+        loader = Throttle(total=5, desc="Test", render_callback=lambda *args: "Custom Render")
+        self.assertEqual(loader.render(), "Custom Render")
+
     def test_default_render_dots(self):
         loader = Throttle(total=10, desc="Test", style="dots")
         loader.update(1)
@@ -49,7 +66,7 @@ class TestProgressLoader(unittest.TestCase):
         loader.update(1)
         self.assertEqual(loader._default_render_dots(), "Test: ..")
 
-    @patch('sys.stdout', new_callable=StringIO)
+    @patch('sys.stdout', new_callable=TTYStringIO)
     def test_render_progress(self, mock_stdout):
         loader = Throttle(total=5, desc="Test", style="bar", bar_length=10, fill_char="=", empty_char=" ")
         loader.start()
@@ -57,8 +74,8 @@ class TestProgressLoader(unittest.TestCase):
         loader.update(2)
         loader.update(3)
         time.sleep(0.2)  # Give some time for the last update to be rendered
-        loader.close()
         output = mock_stdout.getvalue()
+        loader.close()
         # Remove ANSI color codes for comparison
         output = output.replace("\033[94m", "").replace("\033[0m", "")
         self.assertIn("Test: [==========] 100% (5/5 items)", output)
@@ -71,20 +88,28 @@ class TestProgressLoader(unittest.TestCase):
         output = mock_stdout.getvalue()
         self.assertIn("Processing 4 ", output)
 
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_with_function_batches_updates(self, mock_stdout):
+        loader = Throttle(total=20, desc="Loading")
+        with patch.object(loader, "update", wraps=loader.update) as mock_update:
+            loader.with_function(lambda item, throttle: None, list(range(20)))
+        self.assertEqual(loader.completed, 20)
+        self.assertLess(mock_update.call_count, 20)
+
     @patch('sys.stdout', new_callable=StringIO)
     def test_decorator(self, mock_stdout):
         process_data(self.test_data)
         output = mock_stdout.getvalue()
         self.assertIn("Processed 10", output)
 
-    @patch('sys.stdout', new_callable=StringIO)
+    @patch('sys.stdout', new_callable=TTYStringIO)
     def test_with_function_spinner(self, mock_stdout):
         with Throttle(total=10, desc="Processing data", spinner=True) as loader:
             loader.with_function(my_example_function, self.test_data)
         output = mock_stdout.getvalue()
         self.assertIn("Processing data: |", output)
 
-    @patch('sys.stdout', new_callable=StringIO)
+    @patch('sys.stdout', new_callable=TTYStringIO)
     def test_with_function_dots(self, mock_stdout):
         with Throttle(total=10, desc="Processing data", style="dots", fill_char="*", empty_char=".") as loader:
             loader.with_function(my_example_function, self.test_data)
@@ -99,15 +124,82 @@ class TestProgressLoader(unittest.TestCase):
         self.assertEqual(loader.fill_char, "=")
         self.assertEqual(loader.empty_char, " ")
 
-    def test_update_callback(self):
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_update_callback(self, mock_stdout):
         mock_callback = Mock()
         loader = Throttle(total=10, update_callback=mock_callback)
+        loader.start()
         loader.update(1)
+        time.sleep(0.2)
         mock_callback.assert_called_with(1)
         loader.update(4)
+        loader.close()
         mock_callback.assert_called_with(5)
 
     @patch('sys.stdout', new_callable=StringIO)
+    def test_update_callback_debounced(self, mock_stdout):
+        mock_callback = Mock()
+        loader = Throttle(total=1000, update_callback=mock_callback)
+        loader.start()
+        for _ in range(1000):
+            loader.update()
+        time.sleep(0.2)
+        loader.close()
+        mock_callback.assert_called_with(1000)
+        self.assertLess(mock_callback.call_count, 10)
+
+    @patch('sys.stdout', new_callable=TTYStringIO)
+    def test_update_callback_error(self, mock_stdout):
+        calls = []
+
+        def callback(completed):
+            calls.append(completed)
+            if len(calls) == 1:
+                raise RuntimeError("callback failed")
+
+        loader = Throttle(total=10, desc="Test", update_callback=callback)
+        loader.start()
+        loader.update(1)
+        time.sleep(0.2)  # The first callback raises on the render thread
+        with self.assertRaises(RuntimeError):
+            loader.update(2)
+        time.sleep(0.2)
+        output = mock_stdout.getvalue()
+        loader.close()
+        self.assertIn("(3/10 items)", output)  # Still rendering after the error
+        self.assertEqual(calls, [1, 3])
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_with_function_update_callback_error(self, mock_stdout):
+        calls = []
+        processed = []
+
+        def callback(completed):
+            calls.append(completed)
+            if len(calls) == 1:
+                raise RuntimeError("callback failed")
+
+        def func(item, loader):
+            processed.append(item)
+            time.sleep(0.02)
+
+        loader = Throttle(total=40, update_callback=callback)
+        loader.start()
+        with self.assertRaises(RuntimeError):
+            loader.with_function(func, range(40))
+        self.assertEqual(loader.completed, len(processed))  # Nothing counted twice
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_update_callback_runs_outside_lock(self, mock_stdout):
+        calls = []
+        loader = Throttle(total=10, update_callback=lambda completed: calls.append(loader.lock.locked()))
+        loader.start()
+        loader.update(1)
+        time.sleep(0.2)
+        loader.close()
+        self.assertEqual(calls, [False])
+
+    @patch('sys.stdout', new_callable=TTYStringIO)
     def test_render_callback(self, mock_stdout):
         mock_render = Mock(return_value="Custom Render")
         loader = Throttle(total=5, desc="Test", render_callback=mock_render)
@@ -116,8 +208,8 @@ class TestProgressLoader(unittest.TestCase):
         loader.update(2)
         loader.update(3)
         time.sleep(0.2)
-        loader.close()
         output = mock_stdout.getvalue()
+        loader.close()
         self.assertIn("Custom Render", output)
 
     @patch('sys.stdout', new_callable=StringIO)
@@ -131,7 +223,7 @@ class TestProgressLoader(unittest.TestCase):
         output = mock_stdout.getvalue()
         self.assertIn("ERROR:root:An error occurred during processing: Test Exception", output)
 
-    @patch('sys.stdout', new_callable=StringIO)
+    @patch('sys.stdout', new_callable=TTYStringIO)
     def test_render_progress_default_bar(self, mock_stdout):
         loader = Throttle(total=5, desc="Test", style="bar", bar_length=10, fill_char="=", empty_char=" ")
         loader.start()
@@ -139,8 +231,8 @@ class TestProgressLoader(unittest.TestCase):
         loader.update(2)
         loader.update(3)
         time.sleep(0.2)  # Give some time for the last update to be rendered
-        loader.close()
         output = mock_stdout.getvalue()
+        loader.close()
         # Remove ANSI color codes for comparison
         output = output.replace("\033[94m", "").replace("\033[0m", "")
         self.assertIn("Test: [==========] 100% (5/5 items)", output)
@@ -156,15 +248,20 @@ class TestProgressLoader(unittest.TestCase):
         output = loader._default_render_time_clock()
         self.assertEqual(output, "Test: 🕝")  # Expecting the eighth clock emoji
 
-    @patch('sys.stdout', new_callable=StringIO)
+    def test_default_render_time_clock_large_total(self):
+        loader = Throttle(total=20000, desc="Test", style="time_clock")
+        loader.update(10000)  # 50% progress
+        self.assertEqual(loader._default_render_time_clock(), "Test: 🕗")
+
+    @patch('sys.stdout', new_callable=TTYStringIO)
     def test_render_progress_time_clock(self, mock_stdout):
         loader = Throttle(total=10, desc="Test", style="time_clock")
         loader.start()
         time.sleep(0.2)
         loader.update(5)
         time.sleep(0.2)
-        loader.close()
         output = mock_stdout.getvalue()
+        loader.close()
         self.assertIn("Test: 🕗", output)  # Check for a clock emoji in the output
 
     @patch('sys.stdout', new_callable=StringIO)
@@ -176,6 +273,147 @@ class TestProgressLoader(unittest.TestCase):
         output = mock_stdout.getvalue()
         self.assertIn("Test: \x1b[94m[                    ]\x1b[0m 0% (0/10 items)", output)  # Adjusted expected output
 
+    def test_render_progress_redirected_final_frame(self):
+        stdout = TextIOWrapper(BytesIO(), encoding="utf-8")
+        with patch('sys.stdout', stdout):
+            loader = Throttle(total=10, desc="Test", style="time_clock")
+            loader.start()
+            loader.update(5)
+            time.sleep(0.2)
+            loader.close()
+        self.assertEqual(stdout.buffer.getvalue(), "Test: 🕗\n".encode("utf-8"))
+
+    def test_render_progress_redirected_keeps_print_order(self):
+        stdout = TextIOWrapper(BytesIO(), encoding="utf-8")
+        with patch('sys.stdout', stdout):
+            loader = Throttle(total=2, desc="Test", style="dots")
+            loader.start()
+            for i in range(2):
+                print(f"Processed {i + 1}")
+                loader.update()
+            loader.close()
+            stdout.flush()
+        self.assertEqual(stdout.buffer.getvalue(), b"Processed 1\nProcessed 2\nTest: ..\n")
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_render_progress_not_a_tty(self, mock_stdout):
+        loader = Throttle(total=5, desc="Test", style="bar", bar_length=10, fill_char="=", empty_char=" ")
+        loader.start()
+        time.sleep(0.2)
+        loader.update(2)
+        time.sleep(0.2)
+        self.assertEqual(mock_stdout.getvalue(), "")
+        loader.update(3)
+        loader.close()
+        self.assertEqual(mock_stdout.getvalue(), "Test: \033[94m[==========]\033[0m 100% (5/5 items)\n")
+
+    @unittest.skipUnless(hasattr(os, "openpty"), "requires a pseudo-terminal")
+    def test_render_progress_terminal_fd(self):
+        master, slave = os.openpty()
+        with open(slave, "w", encoding="utf-8") as stdout, patch('sys.stdout', stdout):
+            loader = Throttle(total=10, desc="Test", style="time_clock")
+            loader.start()
+            self.assertEqual(loader._stdout_fd, slave)
+            loader.update(5)
+            time.sleep(0.2)
+            loader.close()
+        output = read_pty(master)
+        os.close(master)
+        self.assertIn("Test: 🕗".encode("utf-8"), output)
+
+    @unittest.skipUnless(hasattr(os, "openpty"), "requires a pseudo-terminal")
+    def test_render_progress_terminal_fd_bar(self):
+        master, slave = os.openpty()
+        with open(slave, "w", encoding="utf-8") as stdout, patch('sys.stdout', stdout):
+            loader = Throttle(total=20000, desc="Test", bar_length=10, fill_char="=",
+                              empty_char=" ")
+            loader.start()
+            time.sleep(0.2)
+            loader.update(19999)
+            time.sleep(0.2)
+            loader.close()
+        output = read_pty(master)
+        os.close(master)
+        output = output.replace(b"\033[94m", b"").replace(b"\033[0m", b"")
+        self.assertIn(b"\rTest: [          ] 0% (0/20000 items)", output)
+        self.assertIn(b"\rTest: [========= ] 99% (19999/20000 items)", output)
+
+    @patch('sys.stdout', new_callable=TTYStringIO)
+    def test_render_progress_skips_unchanged_frames(self, mock_stdout):
+        loader = Throttle(total=10, desc="Test", style="bar", refresh_rate=0.05)
+        loader.start()
+        time.sleep(0.3)  # Several ticks without any update
+        loader.close()
+        output = mock_stdout.getvalue()
+        self.assertEqual(output.count("(0/10 items)"), 1)
+
+    @patch('sys.stdout', new_callable=TTYStringIO)
+    def test_render_progress_wakes_on_update(self, mock_stdout):
+        loader = Throttle(total=10, desc="Test", style="dots", refresh_rate=0.05)
+        loader.start()
+        time.sleep(0.3)  # Renderer is now idle, waiting for an update
+        loader.update(3)
+        time.sleep(0.02)  # Well under refresh_rate
+        output = mock_stdout.getvalue()
+        loader.close()
+        self.assertIn("Test: ...", output)
+
+    @patch('sys.stdout', new_callable=TTYStringIO)
+    def test_close_does_not_wait_for_refresh(self, mock_stdout):
+        for spinner in (False, True):
+            loader = Throttle(total=5, desc="Test", refresh_rate=5, spinner=spinner)
+            loader.start()
+            time.sleep(0.05)  # First frame drawn, next one is seconds away
+            loader.update()
+            start = time.monotonic()
+            loader.close()
+            self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_update_not_blocked_by_console_write(self):
+        class SlowStringIO(TTYStringIO):
+            def write(self, text):
+                time.sleep(0.5)
+                return super().write(text)
+
+        with patch('sys.stdout', new_callable=SlowStringIO):
+            loader = Throttle(total=10, desc="Test", style="dots")
+            loader.start()
+            time.sleep(0.05)  # The render thread is now inside the first write
+            start = time.monotonic()
+            loader.update()
+            elapsed = time.monotonic() - start
+            loader.close()
+        self.assertLess(elapsed, 0.1)
+
+    @patch('sys.stdout', new_callable=TTYStringIO)
+    def test_loaders_share_render_thread(self, mock_stdout):
+        loaders = [Throttle(total=10, desc=f"Task {i}", style="dots") for i in range(5)]
+        for loader in loaders:
+            loader.start()
+        for loader in loaders:
+            loader.update(2)
+        time.sleep(0.2)
+        render_threads = [t for t in threading.enumerate() if t.name == "throttle-render"]
+        for loader in loaders:
+            loader.close()
+        self.assertEqual(len(render_threads), 1)
+        output = mock_stdout.getvalue()
+        for i in range(5):
+            self.assertIn(f"Task {i}: ..", output)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_with_function_generator(self, mock_stdout):
+        seen = []
+        loader = Throttle(total=5, desc="Loading")
+        loader.with_function(lambda item, throttle: seen.append(item), (i * i for i in range(5)))
+        self.assertEqual(seen, [0, 1, 4, 9, 16])
+        self.assertEqual(loader.completed, 5)
+
+    def test_with_function_empty_generator(self):
+        loader = Throttle(total=10)
+        with self.assertRaises(ValueError):
+            loader.with_function(my_example_function, iter([]))
+
     def test_with_function_no_data(self):
         loader = Throttle(total=10)
         with self.assertRaises(ValueError):
@@ -216,10 +454,78 @@ class TestProgressLoaderEdgeCases(unittest.TestCase):
         with self.assertRaises(ValueError):
             Throttle(total=10, empty_char="  ")
 
+    def test_invalid_fill_char_type(self):
+        with self.assertRaises(ValueError):
+            Throttle(total=10, fill_char=None)
+        with self.assertRaises(ValueError):
+            Throttle(total=10, fill_char=["#"])
+
     def test_invalid_time_clock(self):
         with self.assertRaises(ValueError):
             Throttle(total=10, style="time_clock", fill_char="##")
 
 
+class TestAsyncProgressLoader(unittest.TestCase):
+
+    @patch('sys.stdout', new_callable=TTYStringIO)
+    def test_render_loop(self, mock_stdout):
+        async def run():
+            async with AsyncThrottle(total=5, desc="Test", bar_length=10, fill_char="=", empty_char=" ") as loader:
+                await asyncio.sleep(0.2)
+                loader.update(2)
+                loader.update(3)
+                await asyncio.sleep(0.2)
+            return loader
+
+        loader = asyncio.run(run())
+        self.assertTrue(loader.render_task.done())
+        output = mock_stdout.getvalue().replace("\033[94m", "").replace("\033[0m", "")
+        self.assertIn("Test: [==========] 100% (5/5 items)", output)
+
+    @patch('sys.stdout', new_callable=TTYStringIO)
+    def test_close_does_not_wait_for_refresh(self, mock_stdout):
+        async def run():
+            async with AsyncThrottle(total=5, desc="Test", refresh_rate=5) as loader:
+                loader.update()
+                await asyncio.sleep(0)
+            return loader
+
+        start = time.monotonic()
+        loader = asyncio.run(run())
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertTrue(loader.render_task.cancelled())
+
+    @patch('sys.stdout', new_callable=TTYStringIO)
+    def test_update_callback_error(self, mock_stdout):
+        def callback(completed):
+            raise RuntimeError("callback failed")
+
+        async def run():
+            async with AsyncThrottle(total=10, update_callback=callback) as loader:
+                loader.update()
+                await asyncio.sleep(0.2)
+                self.assertFalse(loader.render_task.done())
+                with self.assertRaises(RuntimeError):
+                    loader.update()
+
+        with self.assertRaises(RuntimeError):  # Raised again by the final callback on close
+            asyncio.run(run())
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_update_callback(self, mock_stdout):
+        mock_callback = Mock()
+
+        async def run():
+            async with AsyncThrottle(total=10, update_callback=mock_callback) as loader:
+                for _ in range(3):
+                    loader.update()
+                await asyncio.sleep(0.2)
+                mock_callback.assert_called_once_with(3)
+                loader.update(2)
+
+        asyncio.run(run())
+        mock_callback.assert_called_with(5)
+
+
 if __name__ == '__main__':
     unittest.main()